@@ -16,60 +16,177 @@ This hook extends the existing session start functionality to:
 """
 
 import json
+import os
 import sys
+import tempfile
+import time
 import requests
 from pathlib import Path
-from datetime import datetime, timedelta
+
+# Cache the freshness result so repeat session starts skip the stat() scan
+FRESHNESS_CACHE_FILE = Path("ai_docs/.freshness_cache.json")
+FRESHNESS_CACHE_TTL_SECONDS = 3600
+
+def _read_freshness_cache(cache_key: str) -> dict | None:
+    """Return the cached freshness result if the key matches and it's fresh."""
+    try:
+        with open(FRESHNESS_CACHE_FILE, "r") as f:
+            cached = json.load(f)
+        if (
+            cached.get("key") == cache_key
+            and time.time() - cached.get("ts", 0) < FRESHNESS_CACHE_TTL_SECONDS
+        ):
+            return cached.get("result")
+    except (OSError, json.JSONDecodeError, ValueError):
+        pass
+    return None
+
+def _write_freshness_cache(cache_key: str, result: dict) -> None:
+    """Atomically persist the freshness result keyed by the docs' mtimes."""
+    try:
+        payload = {"key": cache_key, "ts": time.time(), "result": result}
+        fd, tmp_path = tempfile.mkstemp(
+            dir=str(FRESHNESS_CACHE_FILE.parent), suffix=".tmp"
+        )
+        with os.fdopen(fd, "w") as f:
+            json.dump(payload, f)
+        os.replace(tmp_path, FRESHNESS_CACHE_FILE)
+    except OSError:
+        pass  # cache is best-effort; never break session start
 
 def check_doc_freshness() -> dict:
     """Check if documentation files are getting stale."""
-    ai_docs_dir = Path("ai_docs")
-    if not ai_docs_dir.exists():
-        return {"needs_update": False, "reason": "ai_docs directory not found"}
-    
     # Check critical documentation files
     critical_docs = [
         "cc_hooks_docs.md",
         "anthropic_docs_subagents.md",
         "anthropic_custom_slash_commands.md",
     ]
-    
+
+    # One scandir pass instead of a stat() per file - DirEntry.stat()
+    # reuses data the kernel already returned from the directory read.
+    # With only a handful of critical docs on local disk this single
+    # pass beats fanning stat() calls across a thread pool; revisit if
+    # the doc list grows large or moves to network/FUSE storage where
+    # per-file stats become round trips worth overlapping.
+    wanted = set(critical_docs)
+    mtimes = {}
+    try:
+        with os.scandir("ai_docs") as entries:
+            for entry in entries:
+                if entry.name in wanted:
+                    mtimes[entry.name] = entry.stat(follow_symlinks=False).st_mtime
+    except FileNotFoundError:
+        return {"needs_update": False, "reason": "ai_docs directory not found"}
+
+    # Plain float epoch arithmetic - no datetime/timedelta objects on
+    # the hook's fast path
+    now = time.time()
     oldest_file = None
-    oldest_age = timedelta(0)
-    
+    oldest_age_seconds = 0.0
+    doc_mtimes = []
+
     for doc_file in critical_docs:
-        file_path = ai_docs_dir / doc_file
-        if file_path.exists():
-            file_age = datetime.now() - datetime.fromtimestamp(file_path.stat().st_mtime)
-            if file_age > oldest_age:
-                oldest_age = file_age
-                oldest_file = doc_file
-    
+        mtime = mtimes.get(doc_file)
+        if mtime is None:
+            continue
+        doc_mtimes.append(f"{doc_file}:{mtime}")
+        file_age_seconds = now - mtime
+        if file_age_seconds > oldest_age_seconds:
+            oldest_age_seconds = file_age_seconds
+            oldest_file = doc_file
+
+    # Reuse the cached result while no critical doc's mtime has changed
+    cache_key = "|".join(doc_mtimes)
+    cached_result = _read_freshness_cache(cache_key)
+    if cached_result is not None:
+        return cached_result
+
     # Consider stale if older than 7 days
-    stale_threshold = timedelta(days=7)
-    needs_update = oldest_age > stale_threshold
-    
-    return {
+    stale_threshold_seconds = 7 * 86400
+    needs_update = oldest_age_seconds > stale_threshold_seconds
+
+    result = {
         "needs_update": needs_update,
         "oldest_file": oldest_file,
-        "oldest_age_days": oldest_age.days,
-        "threshold_days": stale_threshold.days,
+        "oldest_age_days": int(oldest_age_seconds // 86400),
+        "threshold_days": 7,
     }
+    _write_freshness_cache(cache_key, result)
+    return result
 
-def check_anthropic_docs_updated() -> bool:
-    """Check if Anthropic docs have been recently updated (simplified check)."""
+# Reachability result refreshed out-of-band so session start never blocks
+REACHABILITY_CACHE_FILE = Path(".claude/cache/anthropic_reachable.json")
+REACHABILITY_CACHE_TTL_SECONDS = 24 * 3600
+ANTHROPIC_DOCS_URL = "https://docs.anthropic.com/en/docs/claude-code/hooks"
+
+def refresh_anthropic_reachability() -> bool:
+    """Perform the blocking HEAD request and cache the result for later sessions."""
     try:
         # This is a simplified check - in practice you might want to:
         # 1. Check Last-Modified headers
         # 2. Compare content hashes
         # 3. Use a more sophisticated change detection
-        response = requests.head("https://docs.anthropic.com/en/docs/claude-code/hooks", timeout=10)
-        return response.status_code == 200
+        session = requests.Session()
+        session.mount(
+            "https://",
+            requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=1),
+        )
+        response = session.head(ANTHROPIC_DOCS_URL, timeout=10)
+        ok = response.status_code == 200
     except:
-        return False
+        ok = False
+
+    try:
+        REACHABILITY_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(
+            dir=str(REACHABILITY_CACHE_FILE.parent), suffix=".tmp"
+        )
+        with os.fdopen(fd, "w") as f:
+            json.dump({"ts": time.time(), "ok": ok}, f)
+        os.replace(tmp_path, REACHABILITY_CACHE_FILE)
+    except OSError:
+        pass
+    return ok
+
+def check_anthropic_docs_updated() -> bool:
+    """Check if Anthropic docs are reachable without blocking session start.
+
+    Uses the result cached by a previous background refresh; when the cache
+    is stale a detached subprocess re-runs the network check for the NEXT
+    session to read. The current session never waits on the network.
+    """
+    cached_ok = False
+    cache_fresh = False
+    try:
+        with open(REACHABILITY_CACHE_FILE, "r") as f:
+            cached = json.load(f)
+        cached_ok = bool(cached.get("ok", False))
+        cache_fresh = time.time() - cached.get("ts", 0) < REACHABILITY_CACHE_TTL_SECONDS
+    except (OSError, json.JSONDecodeError, ValueError):
+        pass
+
+    if not cache_fresh:
+        try:
+            import subprocess
+            subprocess.Popen(
+                [sys.executable, __file__, "--refresh-reachability"],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                start_new_session=True,
+            )
+        except OSError:
+            pass
+
+    return cached_ok
 
 def main():
     """Main hook execution."""
+    # Background refresh mode spawned by check_anthropic_docs_updated()
+    if "--refresh-reachability" in sys.argv:
+        refresh_anthropic_reachability()
+        sys.exit(0)
+
     try:
         # Read the SessionStart hook data
         input_data = json.loads(sys.stdin.read())
@@ -7,11 +7,31 @@
 # ]
 # ///
 
+import functools
 import os
 import sys
 from dotenv import load_dotenv
 
 
+@functools.lru_cache(maxsize=1)
+def _get_client():
+    """Load .env and build the OpenAI client once per process.
+
+    Repeated prompt_llm() calls reuse the same client (and its keep-alive
+    connection pool) instead of re-scanning for .env and re-instantiating.
+    Returns None if no API key is configured.
+    """
+    load_dotenv()
+
+    api_key = os.getenv("OPENAI_API_KEY")
+    if not api_key:
+        return None
+
+    from openai import OpenAI
+
+    return OpenAI(api_key=api_key)
+
+
 def prompt_llm(prompt_text, model="gpt-5"):
     """
     GPT-5 LLM prompting method with model selection.
@@ -23,17 +43,11 @@ def prompt_llm(prompt_text, model="gpt-5"):
     Returns:
         str: The model's response text, or None if error
     """
-    load_dotenv()
-
-    api_key = os.getenv("OPENAI_API_KEY")
-    if not api_key:
+    client = _get_client()
+    if client is None:
         return None
 
     try:
-        from openai import OpenAI
-
-        client = OpenAI(api_key=api_key)
-
         # GPT-5 and O3 models have different parameter requirements
         if model.startswith(("gpt-5", "o3", "o1")):
             response = client.chat.completions.create(
@@ -57,6 +71,52 @@ def prompt_llm(prompt_text, model="gpt-5"):
         return None
 
 
+def stream_llm(prompt_text, model="gpt-5"):
+    """
+    Stream a completion token-by-token for interactive use.
+
+    Yields chunks of response text as they arrive, so callers can show
+    output at first-token latency instead of waiting for the whole
+    completion. Yields nothing if no API key is configured or on error.
+
+    Args:
+        prompt_text (str): The prompt to send to the model
+        model (str): OpenAI model to use (default: gpt-5)
+
+    Yields:
+        str: Successive fragments of the response text
+    """
+    client = _get_client()
+    if client is None:
+        return
+
+    try:
+        if model.startswith(("gpt-5", "o3", "o1")):
+            response = client.chat.completions.create(
+                model=model,
+                messages=[{"role": "user", "content": prompt_text}],
+                max_completion_tokens=2000,
+                stream=True,
+            )
+        else:
+            response = client.chat.completions.create(
+                model=model,
+                messages=[{"role": "user", "content": prompt_text}],
+                max_tokens=2000,
+                temperature=0.7,
+                stream=True,
+            )
+
+        for chunk in response:
+            if chunk.choices:
+                content = chunk.choices[0].delta.content
+                if content:
+                    yield content
+
+    except Exception as e:
+        print(f"Error with model {model}: {e}", file=sys.stderr)
+
+
 def main():
     """Command line interface for GPT-5 prompting."""
     
@@ -84,7 +144,21 @@ def main():
     
     print(f"Using model: {model}")
     print("-" * 40)
-    
+
+    # Stream to interactive terminals for first-token latency; keep the
+    # buffered path for pipes so output stays a single block
+    if sys.stdout.isatty():
+        wrote_output = False
+        for fragment in stream_llm(prompt_text, model):
+            sys.stdout.write(fragment)
+            sys.stdout.flush()
+            wrote_output = True
+        if wrote_output:
+            print()
+        else:
+            print(f"Error calling OpenAI API with model {model}")
+        return
+
     response = prompt_llm(prompt_text, model)
     if response:
         print(response)
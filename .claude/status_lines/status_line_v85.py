@@ -3,11 +3,16 @@
 # requires-python = ">=3.11"
 # dependencies = [
 #     "python-dotenv",
+#     "orjson",
 # ]
 # ///
 
+import functools
+import hashlib
 import json
 import os
+import random
+import re
 import sys
 from pathlib import Path
 from datetime import datetime
@@ -19,23 +24,49 @@ try:
 except ImportError:
     pass  # dotenv is optional
 
+# orjson parses/serializes several times faster than stdlib json; fall back
+# to stdlib when it isn't installed
+try:
+    import orjson
+
+    def _json_loads(data):
+        return orjson.loads(data)
+
+    def _json_dumps(obj):
+        return orjson.dumps(obj).decode("utf-8")
+
+except ImportError:
+
+    def _json_loads(data):
+        return json.loads(data)
+
+    def _json_dumps(obj):
+        return json.dumps(obj, separators=(",", ":"))
+
+
+# Rotate the append-only log once it passes this size; only stat the file
+# on a sampled fraction of writes to keep the hot path stat-free
+_LOG_MAX_BYTES = 5 * 1024 * 1024
+_LOG_ROTATE_CHECK_EVERY = 16
+
+
+def _maybe_rotate_log(log_file):
+    """Rotate log_file to .jsonl.1 when it exceeds the size bound."""
+    if random.randrange(_LOG_ROTATE_CHECK_EVERY) != 0:
+        return
+    try:
+        if log_file.stat().st_size > _LOG_MAX_BYTES:
+            os.replace(log_file, log_file.with_suffix(".jsonl.1"))
+    except OSError:
+        pass
+
 
 def log_status_line(input_data, status_line_output, error_message=None):
     """Log status line event to logs directory."""
     # Ensure logs directory exists
     log_dir = Path("logs")
     log_dir.mkdir(parents=True, exist_ok=True)
-    log_file = log_dir / "status_line.json"
-
-    # Read existing log data or initialize empty list
-    if log_file.exists():
-        with open(log_file, "r") as f:
-            try:
-                log_data = json.load(f)
-            except (json.JSONDecodeError, ValueError):
-                log_data = []
-    else:
-        log_data = []
+    log_file = log_dir / "status_line.jsonl"
 
     # Create log entry with input data and generated output
     log_entry = {
@@ -48,29 +79,47 @@ def log_status_line(input_data, status_line_output, error_message=None):
     if error_message:
         log_entry["error"] = error_message
 
-    # Append the log entry
-    log_data.append(log_entry)
+    # Append a single JSON line - O(1) regardless of log history size
+    with open(log_file, "a") as f:
+        f.write(_json_dumps(log_entry) + "\n")
 
-    # Write back to file with formatting
-    with open(log_file, "w") as f:
-        json.dump(log_data, f, indent=2)
+    _maybe_rotate_log(log_file)
+
+
+def read_status_line_log():
+    """Yield logged status line entries by streaming the JSONL file."""
+    log_file = Path("logs") / "status_line.jsonl"
+    try:
+        with open(log_file, "r") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield _json_loads(line)
+                except ValueError:
+                    continue
+    except FileNotFoundError:
+        return
 
 
 def get_session_data(session_id):
     """Get session data including agent name, prompts, and extras."""
     session_file = Path(f".claude/data/sessions/{session_id}.json")
 
-    if not session_file.exists():
-        return None, f"Session file {session_file} does not exist"
-
+    # Open directly and handle the missing-file case - one syscall instead
+    # of the racy exists() + open() pair
     try:
-        with open(session_file, "r") as f:
-            session_data = json.load(f)
+        with open(session_file, "rb") as f:
+            session_data = _json_loads(f.read())
             return session_data, None
+    except FileNotFoundError:
+        return None, f"Session file {session_file} does not exist"
     except Exception as e:
         return None, f"Error reading session file: {str(e)}"
 
 
+@functools.lru_cache(maxsize=128)
 def truncate_prompt(prompt, max_length=60):
     """Truncate prompt to specified length to save space for new components."""
     # Remove newlines and excessive whitespace
@@ -81,33 +130,44 @@ def truncate_prompt(prompt, max_length=60):
     return prompt
 
 
+# Single compiled pass over the prompt instead of one lowered scan per category.
+# The prompt is lowercased once up front, which lets the pattern skip the
+# slower IGNORECASE matching machinery.
+_ICON_RE = re.compile(
+    r"\b(?P<create>create|write|add|implement|build)\b"
+    r"|\b(?P<fix>fix|debug|error|issue)\b"
+    r"|\b(?P<refactor>refactor|improve|optimize)\b"
+)
+_ICON_BY_GROUP = {"create": "💡", "fix": "🐛", "refactor": "♻️"}
+
+
+@functools.lru_cache(maxsize=128)
 def get_prompt_icon(prompt):
     """Get icon based on prompt type."""
     if prompt.startswith("/"):
         return "⚡"
     elif "?" in prompt:
         return "❓"
-    elif any(
-        word in prompt.lower()
-        for word in ["create", "write", "add", "implement", "build"]
-    ):
-        return "💡"
-    elif any(word in prompt.lower() for word in ["fix", "debug", "error", "issue"]):
-        return "🐛"
-    elif any(word in prompt.lower() for word in ["refactor", "improve", "optimize"]):
-        return "♻️"
-    else:
-        return "💬"
+    match = _ICON_RE.search(prompt.lower())
+    if match:
+        return _ICON_BY_GROUP[match.lastgroup]
+    return "💬"
 
 
 def format_cost(cost_data):
     """Format cost information compactly."""
     if not cost_data:
         return None
-    
-    total_cost = cost_data.get("total_cost_usd", 0)
-    duration_ms = cost_data.get("total_duration_ms", 0)
-    
+
+    return _format_cost(
+        cost_data.get("total_cost_usd", 0),
+        cost_data.get("total_duration_ms", 0),
+    )
+
+
+@functools.lru_cache(maxsize=128)
+def _format_cost(total_cost, duration_ms):
+    """Memoized cost formatting - the same values repeat across renders."""
     # Format cost: show in cents if under $1, otherwise show dollars
     if total_cost < 1.0:
         cost_str = f"{total_cost * 100:.1f}¢"
@@ -124,28 +184,49 @@ def format_cost(cost_data):
     return f"{cost_str}/{duration_str}"
 
 
+def read_last_lines(file_path, max_lines, block_size=8192):
+    """Read the last max_lines lines of a file without loading the whole file.
+
+    Seeks to the end and scans fixed-size blocks backward, so memory stays
+    O(block_size) even for transcripts that reach tens of MB.
+    """
+    lines = []
+    with open(file_path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        remaining = f.tell()
+        buffer = b""
+        while remaining > 0 and len(lines) <= max_lines:
+            read_size = min(block_size, remaining)
+            remaining -= read_size
+            f.seek(remaining)
+            buffer = f.read(read_size) + buffer
+            lines = buffer.split(b"\n")
+    # Last max_lines non-empty lines, newest first (trailing newline
+    # produces an empty final element from split)
+    tail = [line for line in lines if line][-max_lines:]
+    return [line.decode("utf-8", errors="replace") for line in reversed(tail)]
+
+
 def get_context_size_info(input_data):
     """Attempt to extract context size information from available data."""
     # Try to get token information from transcript if available
     transcript_path = input_data.get("transcript_path")
-    if transcript_path and Path(transcript_path).exists():
+    if transcript_path:
         try:
-            # Read last few lines of transcript to look for token usage
-            with open(transcript_path, 'r') as f:
-                lines = f.readlines()
-                # Check last 5 lines for token information
-                for line in reversed(lines[-5:]):
-                    try:
-                        entry = json.loads(line.strip())
-                        if 'usage' in entry:
-                            usage = entry['usage']
-                            input_tokens = usage.get('input_tokens', 0)
-                            output_tokens = usage.get('output_tokens', 0)
-                            total_tokens = input_tokens + output_tokens
-                            if total_tokens > 0:
-                                return f"{total_tokens//1000}k"
-                    except:
-                        continue
+            # Scan the last few lines of the transcript for token usage,
+            # reading backward from the end instead of the whole file
+            for line in read_last_lines(transcript_path, 5):
+                try:
+                    entry = _json_loads(line.strip())
+                    if 'usage' in entry:
+                        usage = entry['usage']
+                        input_tokens = usage.get('input_tokens', 0)
+                        output_tokens = usage.get('output_tokens', 0)
+                        total_tokens = input_tokens + output_tokens
+                        if total_tokens > 0:
+                            return f"{total_tokens//1000}k"
+                except:
+                    continue
         except:
             pass
     
@@ -158,21 +239,41 @@ def format_extras(extras):
     """Format extras dictionary into a compact string."""
     if not extras:
         return None
-    
-    # Format each key-value pair
+
+    # Tuple-ify the dict so the formatting itself can be memoized
+    return _format_extras(tuple((key, str(value)) for key, value in extras.items()))
+
+
+@functools.lru_cache(maxsize=128)
+def _format_extras(items):
+    """Memoized extras formatting over a hashable (key, value) tuple."""
     pairs = []
-    for key, value in extras.items():
+    for key, str_value in items:
         # Truncate value if too long
-        str_value = str(value)
         if len(str_value) > 15:  # Reduced from 20 to save space
             str_value = str_value[:12] + "..."
         pairs.append(f"{key}:{str_value}")
-    
+
     return " ".join(pairs)
 
 
+# ANSI color constants and component templates, pre-encoded to bytes at
+# import so the per-render path only substitutes values with bytes %
+# formatting and never re-encodes the escape scaffolding (this runs on
+# every prompt turn)
+_RESET = b"\x1b[0m"
+_AGENT_FMT = b"\x1b[91m[%b]" + _RESET  # bright red
+_MODEL_FMT = b"\x1b[34m[%b]" + _RESET  # blue
+_PROMPT_FMT = "%b \033[97m%b\033[0m".encode()  # icon + bright white text
+_NO_PROMPTS = "\033[90m💭 No prompts\033[0m".encode()  # dim gray
+_COST_FMT = "\033[33m💰 %b\033[0m".encode()  # yellow/gold
+_CONTEXT_FMT = "\033[35m📊 %b\033[0m".encode()  # magenta
+_EXTRAS_FMT = b"\x1b[36m[%b]" + _RESET  # dim cyan
+_NO_SESSION_FMT = "\033[36m[%b]\033[0m \033[90m💭 No session data\033[0m".encode()
+
+
 def generate_status_line(input_data):
-    """Generate the enhanced status line with cost and context info."""
+    """Generate the enhanced status line as bytes ready for stdout."""
     # Extract session ID from input data
     session_id = input_data.get("session_id", "unknown")
 
@@ -186,9 +287,10 @@ def generate_status_line(input_data):
     if error:
         # Log the error but show a default message with cost if available
         cost_info = format_cost(input_data.get("cost"))
-        cost_part = f" | \033[33m💰 {cost_info}\033[0m" if cost_info else ""
-        status_line = f"\033[36m[{model_name}]\033[0m \033[90m💭 No session data\033[0m{cost_part}"
-        log_status_line(input_data, status_line, error)
+        status_line = _NO_SESSION_FMT % model_name.encode()
+        if cost_info:
+            status_line += b" | " + _COST_FMT % cost_info.encode()
+        log_status_line(input_data, status_line.decode("utf-8"), error)
         return status_line
 
     # Extract agent name, prompts, and extras
@@ -200,61 +302,87 @@ def generate_status_line(input_data):
     parts = []
 
     # Agent name - Bright Red
-    parts.append(f"\033[91m[{agent_name}]\033[0m")
+    parts.append(_AGENT_FMT % agent_name.encode())
 
     # Model name - Blue
-    parts.append(f"\033[34m[{model_name}]\033[0m")
+    parts.append(_MODEL_FMT % model_name.encode())
 
     # Most recent prompt - shortened to make room for new components
     if prompts:
         current_prompt = prompts[-1]
         icon = get_prompt_icon(current_prompt)
         truncated = truncate_prompt(current_prompt, 50)  # Reduced from 100
-        parts.append(f"{icon} \033[97m{truncated}\033[0m")
+        parts.append(_PROMPT_FMT % (icon.encode(), truncated.encode()))
     else:
-        parts.append("\033[90m💭 No prompts\033[0m")
+        parts.append(_NO_PROMPTS)
 
     # Cost information - Yellow/Gold
     cost_info = format_cost(input_data.get("cost"))
     if cost_info:
-        parts.append(f"\033[33m💰 {cost_info}\033[0m")
+        parts.append(_COST_FMT % cost_info.encode())
 
     # Context/Version information - Magenta
     context_info = get_context_size_info(input_data)
     if context_info:
-        parts.append(f"\033[35m📊 {context_info}\033[0m")
+        parts.append(_CONTEXT_FMT % context_info.encode())
 
     # Add extras if they exist - reduced priority, shown last
     if extras:
         extras_str = format_extras(extras)
         if extras_str:
-            # Display extras in dim cyan with brackets
-            parts.append(f"\033[36m[{extras_str}]\033[0m")
+            parts.append(_EXTRAS_FMT % extras_str.encode())
 
     # Join with separator
-    status_line = " | ".join(parts)
+    status_line = b" | ".join(parts)
 
     return status_line
 
 
+# Cache of the last render: 8-byte blake2b of the input followed by the
+# rendered line, so identical consecutive inputs skip all work
+_LAST_STATUS_CACHE = Path(".claude/cache/last_status.bin")
+
+
 def main():
     try:
-        # Read JSON input from stdin
-        input_data = json.loads(sys.stdin.read())
+        # Read raw input bytes so they can be hashed before parsing
+        raw_input = sys.stdin.buffer.read()
+        input_hash = hashlib.blake2b(raw_input, digest_size=8).digest()
+
+        # Identical input to the previous render? Replay the cached line.
+        try:
+            cached = _LAST_STATUS_CACHE.read_bytes()
+            if cached[:8] == input_hash:
+                sys.stdout.buffer.write(cached[8:])
+                sys.stdout.buffer.flush()
+                sys.exit(0)
+        except OSError:
+            pass
+
+        input_data = _json_loads(raw_input)
 
-        # Generate status line
+        # Generate status line (bytes, ready to write)
         status_line = generate_status_line(input_data)
 
         # Log the status line event (without error since it's successful)
-        log_status_line(input_data, status_line)
+        log_status_line(input_data, status_line.decode("utf-8"))
+
+        # Remember this render for the next invocation
+        try:
+            _LAST_STATUS_CACHE.parent.mkdir(parents=True, exist_ok=True)
+            _LAST_STATUS_CACHE.write_bytes(input_hash + status_line + b"\n")
+        except OSError:
+            pass
 
-        # Output the status line (first line of stdout becomes the status line)
-        print(status_line)
+        # Output the status line (first line of stdout becomes the status
+        # line); write bytes directly, skipping the text-mode encoder
+        sys.stdout.buffer.write(status_line + b"\n")
+        sys.stdout.buffer.flush()
 
         # Success
         sys.exit(0)
 
-    except json.JSONDecodeError:
+    except ValueError:
         # Handle JSON decode errors gracefully - output basic status
         print("\033[31m[Agent] [Claude] 💭 JSON Error\033[0m")
         sys.exit(0)
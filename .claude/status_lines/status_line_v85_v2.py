@@ -1,128 +1,219 @@
-#!/bin/bash
-
-# Efficient bash status line for Claude Code
-# Reads JSON from stdin and outputs status information
-
-# Read JSON input
-input=$(cat)
-
-# Extract basic info using jq (fast single pass)
-model_name=$(echo "$input" | jq -r '.model.display_name // .model.id')
-current_dir=$(echo "$input" | jq -r '.workspace.current_dir // .cwd')
-transcript_path=$(echo "$input" | jq -r '.transcript_path')
-
-# Get folder name
-folder_name=$(basename "$current_dir")
-
-# Get git branch (suppress errors)
-git_branch=""
-if git -C "$current_dir" rev-parse --is-inside-work-tree >/dev/null 2>&1; then
-    git_branch=$(git -C "$current_dir" branch --show-current 2>/dev/null)
-    if [ -z "$git_branch" ]; then
-        git_branch=$(git -C "$current_dir" rev-parse --short HEAD 2>/dev/null)
-    fi
-fi
-
-# Parse transcript file for latest token usage (efficient reverse parsing)
-context_info=""
-if [ -f "$transcript_path" ]; then
-    # Look for the last assistant message with usage data
-    # Use tail -r for efficient reverse reading on macOS, find lines with "type":"assistant"
-    usage_line=$(tail -r "$transcript_path" | grep -m 1 '"type":"assistant"' | head -1)
-    
-    if [ -n "$usage_line" ]; then
-        # Extract usage object from the line using jq
-        usage_data=$(echo "$usage_line" | jq -r '.message.usage // empty' 2>/dev/null)
-        
-        if [ -n "$usage_data" ] && [ "$usage_data" != "null" ]; then
-            # Extract individual token counts
-            input_tokens=$(echo "$usage_data" | jq -r '.input_tokens // 0' 2>/dev/null)
-            cache_creation_tokens=$(echo "$usage_data" | jq -r '.cache_creation_input_tokens // 0' 2>/dev/null)
-            cache_read_tokens=$(echo "$usage_data" | jq -r '.cache_read_input_tokens // 0' 2>/dev/null)
-            output_tokens=$(echo "$usage_data" | jq -r '.output_tokens // 0' 2>/dev/null)
-            
-            # Sum all tokens using bash arithmetic
-            total_tokens=$((input_tokens + cache_creation_tokens + cache_read_tokens + output_tokens))
-            
-            if [ "$total_tokens" -gt 0 ]; then
-                # Calculate percentage using bash arithmetic (multiply by 1000 for one decimal place)
-                percentage_x10=$((total_tokens * 1000 / 200000))
-                percentage_int=$((percentage_x10 / 10))
-                percentage_dec=$((percentage_x10 % 10))
-                
-                # Create clean-style progress bar
-                create_progress_bar() {
-                    local percent=$1
-                    local bar_length=10
-                    local filled_length=$((percent * bar_length / 100))
-                    local empty_length=$((bar_length - filled_length))
-                    
-                    local bar=""
-                    # Add filled dots
-                    for ((i=0; i<filled_length; i++)); do
-                        bar="${bar}●"
-                    done
-                    # Add empty dots
-                    for ((i=0; i<empty_length; i++)); do
-                        bar="${bar}○"
-                    done
-                    
-                    echo "[${bar}]"
-                }
-                
-                # Function to compress numbers
-                compress_number() {
-                    local num=$1
-                    if [ "$num" -lt 1000 ]; then
-                        echo "$num"
-                    elif [ "$num" -lt 1000000 ]; then
-                        # Convert to K format
-                        local k_int=$((num / 1000))
-                        local k_dec=$(((num % 1000) / 100))
-                        if [ "$k_dec" -eq 0 ]; then
-                            echo "${k_int}K"
-                        else
-                            echo "${k_int}.${k_dec}K"
-                        fi
-                    else
-                        # Convert to M format
-                        local m_int=$((num / 1000000))
-                        local m_dec=$(((num % 1000000) / 100000))
-                        if [ "$m_dec" -eq 0 ]; then
-                            echo "${m_int}M"
-                        else
-                            echo "${m_int}.${m_dec}M"
-                        fi
-                    fi
-                }
-                
-                # Compress token numbers
-                compressed_total=$(compress_number "$total_tokens")
-                compressed_max=$(compress_number 200000)
-                
-                # Create progress bar using integer percentage
-                progress_bar=$(create_progress_bar "$percentage_int")
-                
-                context_info=" | CTX: ${progress_bar} ${percentage_int}.${percentage_dec}% (${compressed_total}/${compressed_max})"
-            fi
-        fi
-    fi
-fi
-
-# Build output with ANSI colors
-# Hacker green: \033[92m, Cyan: \033[96m, Orange-red: \033[91m, Reset: \033[0m
-output="\033[92m[$model_name]\033[0m 📁 \033[96m$folder_name\033[0m"
-if [ -n "$git_branch" ]; then
-    output="$output | ⚡️ $git_branch"
-fi
-
-# Add context info with colors if available
-if [ -n "$context_info" ]; then
-    # Color the entire CTX section with orange-red
-    colored_context=$(echo "$context_info" | sed 's/CTX: /\\033[92mCTX:\\033[0m \\033[91m/' | sed 's/$$/\\033[0m/')
-    output="$output$colored_context"
-else
-    output="$output$context_info"
-fi
-
-echo -e "$output"
+#!/usr/bin/env -S uv run --script
+# /// script
+# requires-python = ">=3.11"
+# ///
+
+"""Efficient status line for Claude Code.
+
+Python rewrite of the previous bash implementation, which forked jq,
+tail, grep, basename and git subshells (~15 fork+execs per render).
+This version parses stdin once and does all field extraction and
+arithmetic in-process; the only subprocess left is a single git call.
+"""
+
+import json
+import mmap
+import os
+import subprocess
+import sys
+
+CONTEXT_LIMIT = 200000
+PROGRESS_BAR_LENGTH = 10
+
+# ANSI colors: hacker green, cyan, orange-red
+GREEN = "\033[92m"
+CYAN = "\033[96m"
+RED = "\033[91m"
+RESET = "\033[0m"
+
+
+def _git_cache_file():
+    return f"/tmp/claude_git_cache_{os.getuid()}"
+
+
+def get_git_branch(current_dir):
+    """Get the current git branch, avoiding git forks on the hot path.
+
+    The result is cached in /tmp keyed by the directory and the mtime of
+    .git/HEAD: a stat is sub-microsecond while a git fork+exec costs
+    ~10ms, and HEAD's mtime changes whenever the branch does.
+    """
+    try:
+        head_mtime = os.stat(os.path.join(current_dir, ".git", "HEAD")).st_mtime_ns
+        cache_key = f"{current_dir}:{head_mtime}"
+    except OSError:
+        # No regular .git/HEAD (not a repo, or a worktree) - ask git directly
+        return _git_branch_uncached(current_dir)
+
+    cache_file = _git_cache_file()
+    try:
+        with open(cache_file, "r") as f:
+            cached = json.load(f)
+        if cached.get("key") == cache_key:
+            return cached.get("branch", "")
+    except (OSError, json.JSONDecodeError, ValueError):
+        pass
+
+    branch = _git_branch_uncached(current_dir)
+    try:
+        tmp_file = f"{cache_file}.{os.getpid()}"
+        with open(tmp_file, "w") as f:
+            json.dump({"key": cache_key, "branch": branch}, f)
+        os.replace(tmp_file, cache_file)
+    except OSError:
+        pass
+    return branch
+
+
+def _git_branch_uncached(current_dir):
+    """Fork git to get the current branch (or short HEAD when detached)."""
+    try:
+        result = subprocess.run(
+            ["git", "-C", current_dir, "branch", "--show-current"],
+            capture_output=True,
+            text=True,
+            timeout=2,
+        )
+        if result.returncode != 0:
+            return ""
+        branch = result.stdout.strip()
+        if branch:
+            return branch
+        # Detached HEAD - fall back to the short commit hash
+        result = subprocess.run(
+            ["git", "-C", current_dir, "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            timeout=2,
+        )
+        if result.returncode == 0:
+            return result.stdout.strip()
+    except Exception:
+        pass
+    return ""
+
+
+def find_last_assistant_usage(transcript_path):
+    """Find the usage dict of the last assistant message in the transcript.
+
+    mmaps the file and rfind()s the marker backward from the end, so only
+    the touched pages are faulted in - no copy of the file and no forward
+    scan, regardless of transcript size.
+    """
+    marker = b'"type":"assistant"'
+    try:
+        with open(transcript_path, "rb") as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                pos = mm.rfind(marker)
+                while pos != -1:
+                    line_start = mm.rfind(b"\n", 0, pos) + 1
+                    line_end = mm.find(b"\n", pos)
+                    if line_end == -1:
+                        line_end = mm.size()
+                    try:
+                        entry = json.loads(mm[line_start:line_end])
+                        usage = entry.get("message", {}).get("usage")
+                        if usage:
+                            return usage
+                    except (json.JSONDecodeError, ValueError):
+                        pass
+                    if line_start == 0:
+                        break
+                    pos = mm.rfind(marker, 0, line_start - 1)
+    except (OSError, ValueError):
+        # ValueError covers mmap of an empty file
+        pass
+    return None
+
+
+def compress_number(num):
+    """Compress a number into K/M notation (1234 -> 1.2K)."""
+    if num < 1000:
+        return str(num)
+    if num < 1000000:
+        k_int, k_dec = num // 1000, (num % 1000) // 100
+        return f"{k_int}K" if k_dec == 0 else f"{k_int}.{k_dec}K"
+    m_int, m_dec = num // 1000000, (num % 1000000) // 100000
+    return f"{m_int}M" if m_dec == 0 else f"{m_int}.{m_dec}M"
+
+
+# All possible dot bars (0..PROGRESS_BAR_LENGTH filled), built once at import
+_PROGRESS_BARS = tuple(
+    "[" + "●" * filled + "○" * (PROGRESS_BAR_LENGTH - filled) + "]"
+    for filled in range(PROGRESS_BAR_LENGTH + 1)
+)
+
+# The context limit never changes, so its compressed form doesn't either
+_COMPRESSED_CONTEXT_LIMIT = compress_number(CONTEXT_LIMIT)
+
+
+def create_progress_bar(percent):
+    """Look up the dot-style progress bar for the given percentage."""
+    filled = percent * PROGRESS_BAR_LENGTH // 100
+    return _PROGRESS_BARS[min(filled, PROGRESS_BAR_LENGTH)]
+
+
+def format_context_info(transcript_path):
+    """Build the context-usage segment from the latest assistant usage."""
+    if not transcript_path:
+        return ""
+
+    usage = find_last_assistant_usage(transcript_path)
+    if not usage:
+        return ""
+
+    total_tokens = (
+        usage.get("input_tokens", 0)
+        + usage.get("cache_creation_input_tokens", 0)
+        + usage.get("cache_read_input_tokens", 0)
+        + usage.get("output_tokens", 0)
+    )
+    if total_tokens <= 0:
+        return ""
+
+    # One decimal place of percentage via integer arithmetic
+    percentage_x10 = total_tokens * 1000 // CONTEXT_LIMIT
+    percentage_int, percentage_dec = percentage_x10 // 10, percentage_x10 % 10
+
+    progress_bar = create_progress_bar(percentage_int)
+    compressed_total = compress_number(total_tokens)
+    compressed_max = _COMPRESSED_CONTEXT_LIMIT
+
+    return (
+        f" | {GREEN}CTX:{RESET} {RED}{progress_bar} "
+        f"{percentage_int}.{percentage_dec}% "
+        f"({compressed_total}/{compressed_max}){RESET}"
+    )
+
+
+def generate_status_line(input_data):
+    """Generate the status line from the hook input."""
+    model_info = input_data.get("model", {})
+    model_name = model_info.get("display_name") or model_info.get("id", "Claude")
+
+    workspace = input_data.get("workspace", {})
+    current_dir = workspace.get("current_dir") or input_data.get("cwd", "")
+    folder_name = os.path.basename(current_dir) if current_dir else ""
+
+    output = f"{GREEN}[{model_name}]{RESET} 📁 {CYAN}{folder_name}{RESET}"
+
+    git_branch = get_git_branch(current_dir) if current_dir else ""
+    if git_branch:
+        output += f" | ⚡️ {git_branch}"
+
+    output += format_context_info(input_data.get("transcript_path"))
+
+    return output
+
+
+def main():
+    try:
+        input_data = json.loads(sys.stdin.read())
+        print(generate_status_line(input_data))
+    except Exception:
+        print(f"{GREEN}[Claude]{RESET} 📁")
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
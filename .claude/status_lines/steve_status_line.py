@@ -2,22 +2,40 @@
 # /// script
 # requires-python = ">=3.11"
 # dependencies = [
-#     "python-dotenv",
+#     "orjson",
 # ]
 # ///
 
+# Spawned fresh on every prompt, so interpreter startup is a fixed tax:
+# dotenv is gone (the script never read any .env variable) and subprocess/
+# datetime are imported lazily inside the functions that need them.
+
+import functools
 import json
 import os
+import re
 import sys
-import subprocess
+import time
 from pathlib import Path
-from datetime import datetime
 
+# orjson parses the multi-KB transcript lines several times faster than
+# stdlib json and accepts bytes directly; fall back when not installed
 try:
-    from dotenv import load_dotenv
-    load_dotenv()
+    import orjson
+
+    def _json_loads(data):
+        return orjson.loads(data)
+
+    def _json_dumps(obj):
+        return orjson.dumps(obj).decode('utf-8')
+
 except ImportError:
-    pass  # dotenv is optional
+
+    def _json_loads(data):
+        return json.loads(data)
+
+    def _json_dumps(obj):
+        return json.dumps(obj, separators=(',', ':'))
 
 
 def log_status_line(input_data, status_line_output):
@@ -25,342 +43,493 @@ def log_status_line(input_data, status_line_output):
     # Ensure logs directory exists
     log_dir = Path("logs")
     log_dir.mkdir(parents=True, exist_ok=True)
-    log_file = log_dir / 'status_line.json'
-    
-    # Read existing log data or initialize empty list
-    if log_file.exists():
-        with open(log_file, 'r') as f:
-            try:
-                log_data = json.load(f)
-            except (json.JSONDecodeError, ValueError):
-                log_data = []
-    else:
-        log_data = []
-    
+    log_file = log_dir / 'status_line.jsonl'
+
+    from datetime import datetime
+
     # Create log entry with input data and generated output
     log_entry = {
         "timestamp": datetime.now().isoformat(),
         "input_data": input_data,
         "status_line_output": status_line_output
     }
-    
-    # Append the log entry
-    log_data.append(log_entry)
-    
-    # Write back to file with formatting
-    with open(log_file, 'w') as f:
-        json.dump(log_data, f, indent=2)
 
+    # Append one JSON line - O(1) per render, and concurrent renders
+    # can't clobber each other the way the rewrite-the-array form could
+    with open(log_file, 'a', buffering=1) as f:
+        f.write(_json_dumps(log_entry) + '\n')
 
-def get_git_branch():
-    """Get current git branch if in a git repository."""
+
+# Cached git state: one unified subprocess call, skipped entirely while
+# the relevant .git file mtimes are unchanged
+GIT_STATUS_CACHE_FILE = Path('.claude/data/git_status.cache')
+
+
+def _git_cache_key():
+    """Build a cache key from the mtimes of the .git files that change state."""
+    parts = []
+    for name in ['HEAD', 'index', 'FETCH_HEAD']:
+        try:
+            parts.append(f"{name}:{os.stat(os.path.join('.git', name)).st_mtime_ns}")
+        except OSError:
+            parts.append(f"{name}:-")
+    # Include the current branch ref, which moves on commit
     try:
-        result = subprocess.run(
-            ['git', 'rev-parse', '--abbrev-ref', 'HEAD'],
-            capture_output=True,
-            text=True,
-            timeout=2
-        )
-        if result.returncode == 0:
-            return result.stdout.strip()
-    except Exception:
+        with open('.git/HEAD') as f:
+            head = f.read().strip()
+        if head.startswith('ref: '):
+            ref = head[5:]
+            try:
+                parts.append(f"{ref}:{os.stat(os.path.join('.git', ref)).st_mtime_ns}")
+            except OSError:
+                parts.append(f"{ref}:-")
+    except OSError:
         pass
-    return None
+    return '|'.join(parts)
 
 
-def get_git_status():
-    """Get git status indicators."""
+# Hard wall-clock budget for the foreground git call; if git can't answer
+# in time the render proceeds with cached (or no) git info rather than
+# stalling the prompt. Background refreshes keep the old 2s allowance.
+GIT_BUDGET_SECONDS = 0.2
+
+
+def _run_git_status(timeout=GIT_BUDGET_SECONDS):
+    """Run one `git status --porcelain=v2 --branch` and parse everything."""
+    import subprocess
+
     try:
-        # Check if there are uncommitted changes
-        result = subprocess.run(
-            ['git', 'status', '--porcelain'],
-            capture_output=True,
+        proc = subprocess.Popen(
+            ['git', 'status', '--porcelain=v2', '--branch', '--untracked-files=no'],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
             text=True,
-            timeout=2
         )
-        if result.returncode == 0:
-            changes = result.stdout.strip()
-            if changes:
-                lines = changes.split('\n')
-                return f"±{len(lines)}"
+        try:
+            stdout, _ = proc.communicate(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.communicate()
+            return None
+        if proc.returncode != 0:
+            return None
     except Exception:
+        return None
+
+    state = {'branch': None, 'ahead': 0, 'behind': 0, 'dirty': 0}
+    for line in stdout.splitlines():
+        if line.startswith('# branch.head '):
+            state['branch'] = line.split(' ', 2)[2]
+        elif line.startswith('# branch.ab '):
+            # e.g. "# branch.ab +2 -1"
+            ab = line.split()
+            state['ahead'] = int(ab[2])
+            state['behind'] = -int(ab[3])
+        elif not line.startswith('#'):
+            state['dirty'] += 1
+    return state
+
+
+# The .git mtime key never moves when only working-tree files change, so
+# the ±N dirty count would go stale forever on a key match alone. A cache
+# entry older than this also triggers the background refresh.
+GIT_CACHE_TTL_SECONDS = 5
+
+
+def _write_git_cache(state):
+    """Atomically persist git state so readers never see a torn write."""
+    state['ts'] = time.time()
+    try:
+        GIT_STATUS_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = GIT_STATUS_CACHE_FILE.with_suffix('.tmp')
+        with open(tmp_file, 'w') as f:
+            f.write(_json_dumps(state))
+        os.replace(tmp_file, GIT_STATUS_CACHE_FILE)
+    except OSError:
         pass
+
+
+def refresh_git_cache():
+    """Recompute git state and rewrite the cache (run in the background)."""
+    state = _run_git_status(timeout=2)
+    if state is None:
+        return
+    state['key'] = _git_cache_key()
+    _write_git_cache(state)
+
+
+@functools.lru_cache(maxsize=1)
+def _git_state():
+    """Get git state without blocking the render on git.
+
+    Fresh cache: use it. Stale cache (key mismatch, or older than the
+    TTL - working-tree edits don't move any .git mtime, so age is the
+    only signal that the dirty count may have drifted): render with the
+    previous value and spawn a detached refresh for the NEXT prompt, so
+    worst-case render latency is a fork rather than a full `git status`.
+    Only a missing cache (first run in a repo) blocks to seed it.
+    """
+    cache_key = _git_cache_key()
+    try:
+        with open(GIT_STATUS_CACHE_FILE, 'r') as f:
+            cached = _json_loads(f.read())
+    except Exception:
+        cached = None
+
+    if cached is not None:
+        if (cached.get('key') != cache_key
+                or time.time() - cached.get('ts', 0) > GIT_CACHE_TTL_SECONDS):
+            # Stale-while-revalidate: refresh in the background
+            try:
+                import subprocess
+
+                subprocess.Popen(
+                    [sys.executable, __file__, '--refresh-git-cache'],
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.DEVNULL,
+                    start_new_session=True,
+                )
+            except Exception:
+                pass
+        return cached
+
+    state = _run_git_status()
+    if state is None:
+        return None
+
+    state['key'] = cache_key
+    _write_git_cache(state)
+    return state
+
+
+def get_git_branch():
+    """Get current git branch if in a git repository."""
+    state = _git_state()
+    return state['branch'] if state else None
+
+
+def get_git_status():
+    """Get git status indicators."""
+    state = _git_state()
+    if state and state['dirty']:
+        return f"±{state['dirty']}"
     return ""
 
 
 def get_git_remote_status():
     """Get commits ahead/behind remote."""
-    try:
-        # First check if we have a remote
-        remote_result = subprocess.run(
-            ['git', 'rev-parse', '--abbrev-ref', '@{upstream}'],
-            capture_output=True,
-            text=True,
-            timeout=2
-        )
-        if remote_result.returncode != 0:
-            return ""
-        
-        # Get ahead/behind counts
-        ahead_result = subprocess.run(
-            ['git', 'rev-list', '--count', '@{upstream}..HEAD'],
-            capture_output=True,
-            text=True,
-            timeout=2
-        )
-        behind_result = subprocess.run(
-            ['git', 'rev-list', '--count', 'HEAD..@{upstream}'],
-            capture_output=True,
-            text=True,
-            timeout=2
-        )
-        
-        if ahead_result.returncode == 0 and behind_result.returncode == 0:
-            ahead = int(ahead_result.stdout.strip())
-            behind = int(behind_result.stdout.strip())
-            
-            if ahead > 0 or behind > 0:
-                parts = []
-                if ahead > 0:
-                    parts.append(f"↑{ahead}")
-                if behind > 0:
-                    parts.append(f"↓{behind}")
-                return "".join(parts)
-    except Exception:
-        pass
+    state = _git_state()
+    if state:
+        ahead = state['ahead']
+        behind = state['behind']
+        if ahead > 0 or behind > 0:
+            parts = []
+            if ahead > 0:
+                parts.append(f"↑{ahead}")
+            if behind > 0:
+                parts.append(f"↓{behind}")
+            return "".join(parts)
     return ""
 
 
-def get_token_usage():
-    """Get token usage information from session data."""
+@functools.lru_cache(maxsize=1)
+def _latest_transcript():
+    """Locate the most recently modified transcript file path, or None.
+
+    Memoized so every metric helper in one invocation shares the lookup,
+    and implemented as one scandir pass tracking the max mtime inline -
+    DirEntry.stat() reuses data from the directory read instead of
+    issuing a fresh stat per file the way glob + max(key=stat) did.
+    """
+    best_path = None
+    best_mtime = -1.0
     try:
-        # Try to find recent transcript files
-        transcript_dir = Path('.claude/data/transcripts')
-        if transcript_dir.exists():
-            # Get most recent transcript file
-            transcript_files = list(transcript_dir.glob('*.jsonl'))
-            if transcript_files:
-                latest_transcript = max(transcript_files, key=lambda f: f.stat().st_mtime)
-                
-                # Read last few lines to get recent token usage
-                with open(latest_transcript, 'r') as f:
-                    lines = f.readlines()
-                    for line in reversed(lines[-5:]):
-                        try:
-                            entry = json.loads(line.strip())
-                            if 'usage' in entry:
-                                usage = entry['usage']
-                                input_tokens = usage.get('input_tokens', 0)
-                                output_tokens = usage.get('output_tokens', 0)
-                                total_tokens = input_tokens + output_tokens
-                                
-                                # Estimate context limit (common limits)
-                                context_limit = 200000  # Default for Claude-3
-                                if total_tokens > 0:
-                                    return f"{total_tokens//1000}k/{context_limit//1000}k"
-                        except:
-                            continue
-    except Exception:
-        pass
-    return None
+        with os.scandir('.claude/data/transcripts') as entries:
+            for entry in entries:
+                if entry.name.endswith('.jsonl'):
+                    mtime = entry.stat().st_mtime
+                    if mtime > best_mtime:
+                        best_mtime = mtime
+                        best_path = entry.path
+    except OSError:
+        return None
+    return best_path
 
 
-def get_active_tools():
-    """Get recently used tools from session data."""
+def _tail_lines(path, n, block_size=8192):
+    """Return the last n complete lines of a file as bytes.
+
+    Seeks to the end and pread()s fixed-size blocks backward until enough
+    newlines have accumulated, so reading the tail of a multi-MB transcript
+    touches O(tail) bytes instead of the whole file.
+    """
+    fd = os.open(path, os.O_RDONLY)
     try:
-        # Try to find recent transcript files
-        transcript_dir = Path('.claude/data/transcripts')
-        if transcript_dir.exists():
-            # Get most recent transcript file
-            transcript_files = list(transcript_dir.glob('*.jsonl'))
-            if transcript_files:
-                latest_transcript = max(transcript_files, key=lambda f: f.stat().st_mtime)
-                
-                # Read recent lines to find tool usage
-                tools = set()
-                with open(latest_transcript, 'r') as f:
-                    lines = f.readlines()
-                    for line in reversed(lines[-10:]):  # Check last 10 entries
-                        try:
-                            entry = json.loads(line.strip())
-                            if 'content' in entry:
-                                for content in entry['content']:
-                                    if isinstance(content, dict) and content.get('type') == 'tool_use':
-                                        tool_name = content.get('name', '')
-                                        # Simplify tool names
-                                        if tool_name.startswith('mcp__'):
-                                            tool_name = tool_name.split('__')[-1]  # Get last part
-                                        if tool_name in ['bash', 'Bash']:
-                                            tools.add('Bash')
-                                        elif tool_name in ['read', 'Read']:
-                                            tools.add('Read')
-                                        elif tool_name in ['edit', 'Edit']:
-                                            tools.add('Edit')
-                                        elif tool_name in ['write', 'Write']:
-                                            tools.add('Write')
-                                        elif tool_name:
-                                            tools.add(tool_name.capitalize())
-                        except:
-                            continue
-                
-                if tools:
-                    # Return up to 3 most recent tools
-                    return '|'.join(list(tools)[:3])
-    except Exception:
-        pass
-    return None
+        offset = os.lseek(fd, 0, os.SEEK_END)
+        buffer = b''
+        while offset > 0 and buffer.count(b'\n') <= n:
+            read_size = min(block_size, offset)
+            offset -= read_size
+            buffer = os.pread(fd, read_size, offset) + buffer
+    finally:
+        os.close(fd)
+    lines = [line for line in buffer.split(b'\n') if line]
+    return lines[-n:]
+
 
+def _scan_transcript(transcript_path):
+    """Derive all transcript metrics, scanning only newly appended bytes.
 
-def get_api_metrics():
-    """Get API call count from session data."""
+    The transcript is append-only, so the API-call count is checkpointed
+    in a <transcript>.idx sidecar holding {offset, api_calls}. Each render
+    seeks to the stored offset and counts usage entries in the delta -
+    O(bytes since last render) instead of O(filesize). The windowed
+    token/tool/test metrics come from a backward tail read of the last
+    20 lines, which is O(tail) regardless of file size.
+    """
+    idx_path = transcript_path + '.idx'
+    offset = 0
+    api_calls = 0
     try:
-        # Try to find recent transcript files
-        transcript_dir = Path('.claude/data/transcripts')
-        if transcript_dir.exists():
-            # Get most recent transcript file
-            transcript_files = list(transcript_dir.glob('*.jsonl'))
-            if transcript_files:
-                latest_transcript = max(transcript_files, key=lambda f: f.stat().st_mtime)
-                
-                # Count API calls (Claude responses)
-                api_calls = 0
-                with open(latest_transcript, 'r') as f:
-                    lines = f.readlines()
-                    for line in lines:
-                        try:
-                            entry = json.loads(line.strip())
-                            # Count entries that have usage info (indicating API calls)
-                            if 'usage' in entry:
-                                api_calls += 1
-                        except:
-                            continue
-                
-                if api_calls > 0:
-                    return str(api_calls)
+        with open(idx_path, 'rb') as f:
+            idx = _json_loads(f.read())
+        # Only trust the checkpoint while the file has purely grown
+        if 0 <= idx.get('offset', -1) <= os.path.getsize(transcript_path):
+            offset = idx['offset']
+            api_calls = idx.get('api_calls', 0)
     except Exception:
         pass
-    return None
 
+    with open(transcript_path, 'rb') as f:
+        if offset:
+            f.seek(offset)
+        for line in f:
+            if not line.endswith(b'\n'):
+                # Trailing line still being written - rescan it next render
+                break
+            offset += len(line)
+            # Byte-level prefilter: a substring scan is orders of magnitude
+            # cheaper than json.loads on a multi-KB line, and lines without
+            # the marker can't contribute to the count
+            if b'"usage"' not in line:
+                continue
+            try:
+                entry = _json_loads(line)
+            except:
+                continue
+            # Entries with usage info indicate API calls
+            if 'usage' in entry:
+                api_calls += 1
 
-def get_rate_limits():
-    """Get API rate limit status."""
     try:
-        # This is a placeholder - in practice you'd track this based on your usage
-        # For now, we'll estimate based on recent API calls and time
-        
-        # Try to find recent transcript files to estimate usage
-        transcript_dir = Path('.claude/data/transcripts')
-        if transcript_dir.exists():
-            transcript_files = list(transcript_dir.glob('*.jsonl'))
-            if transcript_files:
-                latest_transcript = max(transcript_files, key=lambda f: f.stat().st_mtime)
-                
-                # Check file modification time to see how recent activity is
-                mod_time = datetime.fromtimestamp(latest_transcript.stat().st_mtime)
-                now = datetime.now()
-                minutes_since_activity = (now - mod_time).total_seconds() / 60
-                
-                # Simple heuristic: if recent activity, show moderate usage
-                if minutes_since_activity < 5:
-                    return "15/100"  # Simulated usage
-                elif minutes_since_activity < 30:
-                    return "5/100"   # Lower usage
-    except Exception:
+        tmp_path = idx_path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            f.write(_json_dumps({'offset': offset, 'api_calls': api_calls}))
+        os.replace(tmp_path, idx_path)
+    except OSError:
         pass
-    return None
 
+    # Parse only tail lines that can matter to a windowed metric; a None
+    # placeholder keeps the window positions of skipped chatter lines
+    recent_entries = []
+    for raw_line in _tail_lines(transcript_path, 20):
+        if not _RELEVANT_LINE.search(raw_line):
+            recent_entries.append(None)
+            continue
+        try:
+            recent_entries.append(_json_loads(raw_line))
+        except:
+            recent_entries.append(None)
+    return api_calls, recent_entries
+
+
+# One compiled alternation scan classifies a line's relevance to any of
+# the windowed metrics - a single pass over the bytes instead of one
+# substring test per marker
+_RELEVANT_LINE = re.compile(rb'"(usage|tool_use|Bash|bash)"')
+
+
+def _tool_uses(entries):
+    """Yield tool_use content blocks from the given entries."""
+    for entry in entries:
+        if entry and 'content' in entry:
+            for content in entry['content']:
+                if isinstance(content, dict) and content.get('type') == 'tool_use':
+                    yield content
 
-def get_test_status():
-    """Get recent test run status."""
+
+def get_transcript_metrics():
+    """Get token usage, active tools, API calls and test status in one scan."""
+    metrics = {
+        'token_usage': None,
+        'active_tools': None,
+        'api_calls': None,
+        'test_status': None,
+    }
     try:
-        # Check recent bash commands for test runs in transcript
-        transcript_dir = Path('.claude/data/transcripts')
-        if transcript_dir.exists():
-            transcript_files = list(transcript_dir.glob('*.jsonl'))
-            if transcript_files:
-                latest_transcript = max(transcript_files, key=lambda f: f.stat().st_mtime)
-                
-                with open(latest_transcript, 'r') as f:
-                    lines = f.readlines()
-                    for line in reversed(lines[-20:]):  # Check last 20 entries
-                        try:
-                            entry = json.loads(line.strip())
-                            if 'content' in entry:
-                                for content in entry['content']:
-                                    if isinstance(content, dict) and content.get('type') == 'tool_use':
-                                        if content.get('name') in ['Bash', 'bash']:
-                                            command = content.get('parameters', {}).get('command', '')
-                                            if any(test_cmd in command.lower() for test_cmd in 
-                                                  ['pytest', 'npm test', 'yarn test', 'test', 'rspec']):
-                                                return "✓"  # Assume tests passed if no recent failures
-                        except:
-                            continue
+        latest_transcript = _latest_transcript()
+        if latest_transcript is None:
+            return metrics
+
+        api_calls, recent_entries = _scan_transcript(latest_transcript)
+
+        if api_calls > 0:
+            metrics['api_calls'] = str(api_calls)
+
+        # Token usage: most recent usage entry within the last 5 entries
+        for entry in reversed(recent_entries[-5:]):
+            if entry and 'usage' in entry:
+                usage = entry['usage']
+                input_tokens = usage.get('input_tokens', 0)
+                output_tokens = usage.get('output_tokens', 0)
+                total_tokens = input_tokens + output_tokens
+
+                # Estimate context limit (common limits)
+                context_limit = 200000  # Default for Claude-3
+                if total_tokens > 0:
+                    metrics['token_usage'] = f"{total_tokens//1000}k/{context_limit//1000}k"
+                    break
+
+        # Active tools: tool_use blocks within the last 10 entries
+        tools = set()
+        for content in _tool_uses(reversed(recent_entries[-10:])):
+            tool_name = content.get('name', '')
+            # Simplify tool names
+            if tool_name.startswith('mcp__'):
+                tool_name = tool_name.split('__')[-1]  # Get last part
+            if tool_name in ['bash', 'Bash']:
+                tools.add('Bash')
+            elif tool_name in ['read', 'Read']:
+                tools.add('Read')
+            elif tool_name in ['edit', 'Edit']:
+                tools.add('Edit')
+            elif tool_name in ['write', 'Write']:
+                tools.add('Write')
+            elif tool_name:
+                tools.add(tool_name.capitalize())
+        if tools:
+            # Return up to 3 most recent tools
+            metrics['active_tools'] = '|'.join(list(tools)[:3])
+
+        # Test status: recent Bash tool_use running a test command
+        for content in _tool_uses(reversed(recent_entries)):
+            if content.get('name') in ['Bash', 'bash']:
+                command = content.get('parameters', {}).get('command', '')
+                if any(test_cmd in command.lower() for test_cmd in
+                      ['pytest', 'npm test', 'yarn test', 'test', 'rspec']):
+                    metrics['test_status'] = "✓"  # Assume tests passed if no recent failures
+                    break
     except Exception:
         pass
-    return None
+    return metrics
+
+
+# outputStyle cache keyed by the settings files' (mtime, size) - on the
+# steady state a render does two stats instead of two opens + parses
+SETTINGS_CACHE_FILE = '.claude/.settings.cache'
+_SETTINGS_FILES = ('.claude/settings.local.json', '.claude/settings.json')
 
 
 def get_output_style():
-    """Get current output style from settings files."""
+    """Get current output style from settings files (local takes priority)."""
+    key_parts = []
+    for settings_path in _SETTINGS_FILES:
+        try:
+            st = os.stat(settings_path)
+            key_parts.append(f"{st.st_mtime_ns}:{st.st_size}")
+        except OSError:
+            key_parts.append('-')
+    cache_key = '|'.join(key_parts)
+
     try:
-        # Try to read from settings.local.json first
-        local_settings_path = Path('.claude/settings.local.json')
-        if local_settings_path.exists():
-            with open(local_settings_path, 'r') as f:
-                settings = json.load(f)
-                if 'outputStyle' in settings:
-                    return settings['outputStyle']
-        
-        # Fallback to main settings.json
-        settings_path = Path('.claude/settings.json')
-        if settings_path.exists():
-            with open(settings_path, 'r') as f:
-                settings = json.load(f)
-                if 'outputStyle' in settings:
-                    return settings['outputStyle']
+        with open(SETTINGS_CACHE_FILE, 'rb') as f:
+            cached = _json_loads(f.read())
+        if cached.get('key') == cache_key:
+            return cached.get('outputStyle')
     except Exception:
         pass
-    return None
 
+    output_style = None
+    for settings_path in _SETTINGS_FILES:
+        try:
+            with open(settings_path, 'rb') as f:
+                settings = _json_loads(f.read())
+            if 'outputStyle' in settings:
+                output_style = settings['outputStyle']
+                break
+        except Exception:
+            continue
+
+    try:
+        tmp_path = SETTINGS_CACHE_FILE + '.tmp'
+        with open(tmp_path, 'w') as f:
+            f.write(_json_dumps({'key': cache_key, 'outputStyle': output_style}))
+        os.replace(tmp_path, SETTINGS_CACHE_FILE)
+    except OSError:
+        pass
+    return output_style
+
+
+# Component templates pre-encoded to bytes at import; the render path only
+# substitutes values via bytes %-formatting and never re-encodes the color
+# scaffolding
+_MODEL_FMT = b'\x1b[31m[%b]\x1b[0m'  # Red with brackets
+_DIR_FMT = '\033[34m📁 %b\033[0m'.encode()  # Blue
+_GIT_FMT = '\033[32m🌿 %b\033[0m'.encode()  # Green
+_TOKENS_FMT = '\033[35m🎯 %b\033[0m'.encode()  # Magenta
+_TOOLS_FMT = '\033[36m🔧 %b\033[0m'.encode()  # Cyan
+_COST_FMT = '\033[33m💰 %b\033[0m'.encode()  # Yellow
+_API_FMT = '\033[37m🌐 %b\033[0m'.encode()  # White
+_TEST_FMT = '\033[92m🧪 %b\033[0m'.encode()  # Bright green
+
+
+# Render order: (state key, pre-encoded template). Adding a segment means
+# one entry here plus one value in _gather_state.
+_SEGMENTS = (
+    ('model', _MODEL_FMT),
+    ('dir', _DIR_FMT),
+    ('git', _GIT_FMT),
+    ('tokens', _TOKENS_FMT),
+    ('tools', _TOOLS_FMT),
+    ('cost', _COST_FMT),
+    ('api', _API_FMT),
+    ('test', _TEST_FMT),
+)
+
+
+def _gather_state(input_data):
+    """Collect every displayable value into one dict, fetching each once."""
+    state = {}
 
-def generate_status_line(input_data):
-    """Generate the enhanced detailed status line."""
-    parts = []
-    
     # Model display name
     model_info = input_data.get('model', {})
-    model_name = model_info.get('display_name', 'Claude')
-    parts.append(f"\033[31m[{model_name}]\033[0m")  # Red with brackets
-    
+    state['model'] = model_info.get('display_name', 'Claude')
+
     # Current directory
     workspace = input_data.get('workspace', {})
     current_dir = workspace.get('current_dir', '')
     if current_dir:
-        dir_name = os.path.basename(current_dir)
-        parts.append(f"\033[34m📁 {dir_name}\033[0m")  # Blue color
-    
+        state['dir'] = os.path.basename(current_dir)
+
     # Git branch, remote status, and local status
     git_branch = get_git_branch()
     if git_branch:
         git_remote = get_git_remote_status()
         git_local = get_git_status()
-        git_info = f"🌿 {git_branch}"
+        git_info = git_branch
         if git_remote:
             git_info += f" {git_remote}"
         if git_local:
             git_info += f" {git_local}"
-        parts.append(f"\033[32m{git_info}\033[0m")  # Green color
-    
-    # Token usage
-    token_usage = get_token_usage()
-    if token_usage:
-        parts.append(f"\033[35m🎯 {token_usage}\033[0m")  # Magenta
-    
-    # Active tools
-    active_tools = get_active_tools()
-    if active_tools:
-        parts.append(f"\033[36m🔧 {active_tools}\033[0m")  # Cyan
-    
+        state['git'] = git_info
+
+    # Transcript-derived metrics, computed in a single scan
+    metrics = get_transcript_metrics()
+    state['tokens'] = metrics['token_usage']
+    state['tools'] = metrics['active_tools']
+    state['api'] = metrics['api_calls']
+    state['test'] = metrics['test_status']
+
     # Cost information
     version = input_data.get('version', '')
     output_style = get_output_style()
@@ -370,51 +539,74 @@ def generate_status_line(input_data):
             cost_parts.append(f"v{version}")
         if output_style:
             cost_parts.append(output_style)
-        parts.append(f"\033[33m💰 {'/'.join(cost_parts)}\033[0m")  # Yellow
-    
-    # API call metrics
-    api_calls = get_api_metrics()
-    if api_calls:
-        parts.append(f"\033[37m🌐 {api_calls}\033[0m")  # White
-    
-    # Rate limits
-    rate_limits = get_rate_limits()
-    if rate_limits:
-        parts.append(f"\033[91m🚦 {rate_limits}\033[0m")  # Bright red
-    
-    # Test status
-    test_status = get_test_status()
-    if test_status:
-        parts.append(f"\033[92m🧪 {test_status}\033[0m")  # Bright green
-    
-    return " | ".join(parts)
+        state['cost'] = '/'.join(cost_parts)
+
+    return state
+
+
+def generate_status_line(input_data):
+    """Generate the enhanced detailed status line as bytes."""
+    state = _gather_state(input_data)
+    return b' | '.join(
+        template % state[key].encode()
+        for key, template in _SEGMENTS
+        if state.get(key)
+    )
+
+
+# Degraded-path lines, encoded once: written straight to fd 1 with
+# os._exit so even a malformed-stdin render stays sub-millisecond
+_ERR_UNKNOWN = '\033[31m[Claude] 📁 Unknown\033[0m\n'.encode()
+_ERR_ERROR = '\033[31m[Claude] 📁 Error\033[0m\n'.encode()
 
 
 def main():
+    # Background refresh mode spawned by _git_state()
+    if '--refresh-git-cache' in sys.argv:
+        refresh_git_cache()
+        sys.exit(0)
+
     try:
         # Read JSON input from stdin
-        input_data = json.loads(sys.stdin.read())
+        input_data = _json_loads(sys.stdin.buffer.read())
         
         # Generate status line
         status_line = generate_status_line(input_data)
-        
-        # Log the status line event
-        log_status_line(input_data, status_line)
-        
-        # Output the status line (first line of stdout becomes the status line)
-        print(status_line)
-        
+
+        # Output the status line first (first line of stdout becomes the
+        # status line) - written as bytes, skipping the text encoder, and
+        # before logging so the log write can't delay the render
+        sys.stdout.buffer.write(status_line)
+        sys.stdout.buffer.write(b'\n')
+        sys.stdout.buffer.flush()
+
+        # Fire-and-forget logging: a forked child does the file IO after
+        # the shell has already consumed stdout; fall back to an inline
+        # write where fork isn't available
+        try:
+            pid = os.fork()
+        except (OSError, AttributeError):
+            pid = -1
+        if pid == 0:
+            try:
+                log_status_line(input_data, status_line.decode('utf-8'))
+            finally:
+                os._exit(0)
+        elif pid < 0:
+            log_status_line(input_data, status_line.decode('utf-8'))
+
         # Success
         sys.exit(0)
         
-    except json.JSONDecodeError:
-        # Handle JSON decode errors gracefully - output basic status
-        print("\033[31m[Claude] 📁 Unknown\033[0m")
-        sys.exit(0)
+    except ValueError:
+        # Handle JSON decode errors gracefully - output basic status.
+        # (ValueError covers both stdlib and orjson decode errors.)
+        os.write(1, _ERR_UNKNOWN)
+        os._exit(0)
     except Exception:
         # Handle any other errors gracefully - output basic status
-        print("\033[31m[Claude] 📁 Error\033[0m")
-        sys.exit(0)
+        os.write(1, _ERR_ERROR)
+        os._exit(0)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Test Bulk Completion Dispatch for AI Car Repair Assistant
+Smoke-tests dispatch_chat_completions against a stubbed OpenAI client,
+covering concurrent fan-out, result ordering, and per-call failure handling
+"""
+
+import sys
+import os
+
+# Add current directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+os.environ.setdefault('OPENAI_API_KEY', 'sk-test-dispatch')
+
+import AgentRepair
+from AgentRepair import dispatch_chat_completions
+
+
+class _StubChoice:
+    def __init__(self, content):
+        self.message = type('Message', (), {'content': content})()
+
+
+class _StubCompletions:
+    """Stands in for client.chat.completions, echoing the user message."""
+
+    def create(self, model, messages, max_tokens, temperature):
+        content = messages[-1]['content']
+        if content == 'FAIL':
+            raise RuntimeError('simulated API failure')
+        return type('Response', (), {'choices': [_StubChoice(f"echo: {content}")]})()
+
+
+class _StubClient:
+    def __init__(self):
+        self.chat = type('Chat', (), {'completions': _StubCompletions()})()
+
+
+def test_dispatch():
+    """Test concurrent dispatch, ordering, and graceful per-call failure"""
+    print("🧪 Testing Bulk Completion Dispatch")
+    print("=" * 50)
+
+    # Swap in the stub client so no network is touched
+    AgentRepair._openai_client = _StubClient()
+
+    try:
+        prompts = [[{"role": "user", "content": f"question {i}"}] for i in range(5)]
+        results = dispatch_chat_completions(prompts, max_workers=3)
+
+        if results != [f"echo: question {i}" for i in range(5)]:
+            print(f"❌ Unexpected results: {results}")
+            return False
+        print("✅ Results returned in input order")
+
+        mixed = [
+            [{"role": "user", "content": "ok one"}],
+            [{"role": "user", "content": "FAIL"}],
+            [{"role": "user", "content": "ok two"}],
+        ]
+        results = dispatch_chat_completions(mixed)
+        if results != ["echo: ok one", None, "echo: ok two"]:
+            print(f"❌ Failure handling broken: {results}")
+            return False
+        print("✅ Failed call returned None without aborting the batch")
+
+        if dispatch_chat_completions([]) != []:
+            print("❌ Empty batch should return an empty list")
+            return False
+        print("✅ Empty batch handled")
+
+        return True
+    finally:
+        AgentRepair._openai_client = None
+
+
+def main():
+    passed = test_dispatch()
+    print(f"\n🎯 Overall Result: {'PASSED' if passed else 'FAILED'}")
+    return 0 if passed else 1
+
+
+if __name__ == "__main__":
+    exit(main())